@@ -4,512 +4,362 @@ AWS RAG System Architecture Diagram Generator
 Generates an architecture diagram using SVG and converts to PNG
 """
 
-import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from xml.sax.saxutils import escape
+import functools
+import hashlib
 import subprocess
+import shutil
+import sys
 import os
 
-def create_svg_architecture():
-    """Create SVG architecture diagram"""
+try:
+    import cairosvg
+except (ImportError, OSError):
+    # OSError: cairosvg is installed but the cairo library is not
+    cairosvg = None
+
+# The diagram is fully determined by this script, so a hash of its source
+# identifies the generated SVG
+with open(__file__, 'rb') as _src:
+    DIAGRAM_KEY = hashlib.blake2b(_src.read(), digest_size=8).hexdigest()
+
+# Static parts of the document, emitted verbatim
+XML_PROLOG = '<?xml version="1.0" encoding="UTF-8"?>\n'
+SVG_OPEN = ('<svg width="{width}" height="{height}" viewBox="0 0 1600 1200" '
+            'xmlns="http://www.w3.org/2000/svg">')
+ARROW_DEFS = ('<defs><marker id="arrowhead" markerWidth="10" markerHeight="7" refX="10" '
+              'refY="3.5" orient="auto"><polygon points="0 0, 10 3.5, 0 7" fill="#333" />'
+              '</marker></defs>')
+
+# Define colors
+COLORS = {
+    'client': '#FF9900',
+    'api': '#146EB4',
+    'lambda': '#F68D11',
+    'storage': '#569A31',
+    'ai': '#9D5FA6',
+    'search': '#005276'
+}
+
+# Text styles shared by the labels: font-size, weight, anchor and fill attributes
+_TXT_NAVY_32_BOLD = 'font-size="32" font-weight="bold" text-anchor="middle" fill="#232F3E"'
+_TXT_NAVY_18_BOLD = 'font-size="18" font-weight="bold" text-anchor="middle" fill="#232F3E"'
+_TXT_GRAY_18 = 'font-size="18" text-anchor="middle" fill="#666"'
+_TXT_WHITE_20_BOLD = 'font-size="20" font-weight="bold" text-anchor="middle" fill="white"'
+_TXT_WHITE_18_BOLD = 'font-size="18" font-weight="bold" text-anchor="middle" fill="white"'
+_TXT_WHITE_16_BOLD = 'font-size="16" font-weight="bold" text-anchor="middle" fill="white"'
+_TXT_WHITE_14_BOLD = 'font-size="14" font-weight="bold" text-anchor="middle" fill="white"'
+_TXT_WHITE_14 = 'font-size="14" text-anchor="middle" fill="white"'
+_TXT_WHITE_12 = 'font-size="12" text-anchor="middle" fill="white"'
+_TXT_WHITE_11 = 'font-size="11" text-anchor="middle" fill="white"'
+_TXT_WHITE_11_ITALIC = 'font-size="11" text-anchor="middle" fill="white" font-style="italic"'
+_TXT_BLUE_14_BOLD = 'font-size="14" font-weight="bold" text-anchor="middle" fill="#146EB4"'
+_TXT_DARK_11 = 'font-size="11" text-anchor="middle" fill="#333"'
+_TXT_DARK_10 = 'font-size="10" text-anchor="middle" fill="#333"'
+
+# (id, x, y, width, height, fill, title, title style, subtitle, subtitle style)
+BOXES = (
+    ('frontend', 100, 150, 250, 100, COLORS['client'], 'React Frontend', _TXT_WHITE_18_BOLD, 'TypeScript + Tailwind CSS', _TXT_WHITE_14),
+    ('api-gateway', 650, 150, 300, 100, COLORS['api'], 'API Gateway', _TXT_WHITE_18_BOLD, 'REST API with CORS', _TXT_WHITE_14),
+    ('s3', 100, 550, 200, 100, COLORS['storage'], 'S3 Bucket', _TXT_WHITE_16_BOLD, 'Document Storage', _TXT_WHITE_12),
+    ('dynamodb', 350, 550, 200, 100, COLORS['storage'], 'DynamoDB', _TXT_WHITE_16_BOLD, 'Document Metadata', _TXT_WHITE_12),
+    ('opensearch', 600, 550, 300, 100, COLORS['search'], 'OpenSearch Service', _TXT_WHITE_16_BOLD, 'Vector Search (t3.small)', _TXT_WHITE_12),
+    ('cloudwatch', 950, 550, 200, 100, '#759C3E', 'CloudWatch', _TXT_WHITE_16_BOLD, 'Logs & Metrics', _TXT_WHITE_12),
+)
+
+LAMBDA_FUNCTIONS = (
+    {'name': 'Upload', 'x': 150, 'desc': 'File Upload'},
+    {'name': 'Process', 'x': 350, 'desc': 'Text Extract'},
+    {'name': 'Query', 'x': 550, 'desc': 'RAG Query'},
+    {'name': 'Dashboard', 'x': 750, 'desc': 'Statistics'},
+    {'name': 'Status', 'x': 950, 'desc': 'Doc Status'},
+    {'name': 'Delete', 'x': 1150, 'desc': 'Doc Delete'}
+)
+
+# Connections: (x1, y1, x2, y2, label)
+ARROWS = (
+    # Frontend to API Gateway
+    (350, 200, 650, 200, 'HTTPS'),
+
+    # API Gateway to Lambda functions
+    (800, 250, 225, 350, ''),
+    (800, 250, 425, 350, ''),
+    (800, 250, 625, 350, ''),
+    (800, 250, 825, 350, ''),
+    (800, 250, 1025, 350, ''),
+    (800, 250, 1225, 350, ''),
+
+    # Lambda to Storage connections
+    # Upload to S3
+    (225, 430, 200, 550, ''),
+    # Process to S3, DynamoDB, OpenSearch
+    (425, 430, 200, 550, ''),
+    (425, 430, 450, 550, ''),
+    (425, 430, 750, 550, ''),
+    # Query to OpenSearch
+    (625, 430, 750, 550, ''),
+    # Dashboard to S3, OpenSearch
+    (825, 430, 200, 550, ''),
+    (825, 430, 750, 550, ''),
+    # Status to OpenSearch
+    (1025, 430, 750, 550, ''),
+    # Delete to S3, DynamoDB
+    (1225, 430, 200, 550, ''),
+    (1225, 430, 450, 550, ''),
+
+    # Lambda to CloudWatch
+    (825, 430, 1050, 550, ''),
+
+    # Lambda to Bedrock
+    (425, 430, 600, 750, ''),
+    (625, 430, 1000, 750, ''),
+)
+
+# (column title, items, center x)
+FEATURES = (
+    ('Lambda Functions', ('6 Functions (Go)', 'provided.al2023 runtime', '512MB Memory', '30s-300s Timeout'), 200),
+    ('Storage', ('S3 with Versioning', 'DynamoDB Pay-per-request', 'CloudWatch 14-day retention'), 500),
+    ('Search', ('OpenSearch 2.3', 't3.small instance', '10GB gp3 storage', 'KNN Vector Search'), 800),
+    ('AI/ML', ('Titan Embeddings V1', 'Claude 3 Sonnet', '1536-dim vectors', 'RAG Generation'), 1100),
+    ('API', ('REST API', 'CORS Enabled', 'OpenAPI 3.0.1', 'Multiple Endpoints'), 1400)
+)
+
+# Preferred PNG converter: (executable, label, arguments)
+RSVG_CONVERT = ('rsvg-convert', 'rsvg-convert', ['-f', 'png', '-o', 'aws-architecture.png', 'aws-architecture.svg'])
+
+# Slower converters tried when neither rsvg-convert nor cairosvg is available
+FALLBACK_CONVERTERS = (
+    ('inkscape', 'Inkscape', ['aws-architecture.svg', '--export-type=png', '--export-filename=aws-architecture.png']),
+    # Huffman-only DEFLATE without row filtering: the PNG is regenerated on demand,
+    # so encoding speed matters more than file size
+    ('convert', 'ImageMagick', ['aws-architecture.svg',
+                                '-define', 'png:compression-level=1',
+                                '-define', 'png:compression-filter=0',
+                                '-define', 'png:compression-strategy=2',
+                                'aws-architecture.png'])
+)
+
+def rect(x, y, w, h, fill, rx=0, stroke='#000', stroke_width=2):
+    """Format an SVG <rect> element"""
+    return (f'<rect x="{x}" y="{y}" width="{w}" height="{h}" fill="{fill}" '
+            f'stroke="{stroke}" stroke-width="{stroke_width}" rx="{rx}" />')
+
+def text(x, y, style, content):
+    """Format an SVG <text> element with one of the _TXT_* styles"""
+    return f'<text x="{x}" y="{y}" {style}>{escape(content)}</text>'
+
+# Lambda box with only the per-function fields left as placeholders
+_LAMBDA_GROUP = ''.join((
+    '<g id="lambda-{id}">',
+    rect('{x}', 350, 150, 80, COLORS['lambda'], rx=8),
+    text('{cx}', 380, _TXT_WHITE_14_BOLD, '{name}'),
+    text('{cx}', 405, _TXT_WHITE_11, '{desc}'),
+    '</g>',
+))
+
+def emit_box(parts, spec):
+    """Append a labelled service box described by a BOXES entry"""
+    box_id, x, y, w, h, fill, title, title_style, sub, sub_style = spec
+    cx = x + w // 2
+    parts.append(f'<g id="{box_id}">')
+    parts.append(rect(x, y, w, h, fill, rx=10))
+    parts.append(text(cx, y + 40, title_style, title))
+    parts.append(text(cx, y + 70, sub_style, sub))
+    parts.append('</g>')
+
+def key_comment(width, height):
+    """Return the comment identifying a diagram generated with these parameters"""
+    return f'<!-- key={DIAGRAM_KEY} size={width}x{height} -->'
+
+@functools.lru_cache(maxsize=8)
+def create_svg_architecture(width=1600, height=1200):
+    """Create SVG architecture diagram, scaled to width x height pixels"""
     
     # SVG setup
-    svg = ET.Element('svg', {
-        'width': '1600',
-        'height': '1200',
-        'xmlns': 'http://www.w3.org/2000/svg',
-        'xmlns:xlink': 'http://www.w3.org/1999/xlink'
-    })
+    parts = [XML_PROLOG, key_comment(width, height) + '\n',
+             SVG_OPEN.format(width=width, height=height), ARROW_DEFS]
     
     # Background
-    bg = ET.SubElement(svg, 'rect', {
-        'width': '1600',
-        'height': '1200',
-        'fill': '#f5f5f5'
-    })
+    parts.append('<rect width="1600" height="1200" fill="#f5f5f5" />')
     
     # Title
-    title = ET.SubElement(svg, 'text', {
-        'x': '800',
-        'y': '50',
-        'font-size': '32',
-        'font-weight': 'bold',
-        'text-anchor': 'middle',
-        'fill': '#232F3E'
-    })
-    title.text = 'AWS Serverless RAG System Architecture'
-    
-    subtitle = ET.SubElement(svg, 'text', {
-        'x': '800',
-        'y': '85',
-        'font-size': '18',
-        'text-anchor': 'middle',
-        'fill': '#666'
-    })
-    subtitle.text = 'Current Implementation with OpenSearch'
-    
-    # Define colors
-    colors = {
-        'client': '#FF9900',
-        'api': '#146EB4',
-        'lambda': '#F68D11',
-        'storage': '#569A31',
-        'ai': '#9D5FA6',
-        'search': '#005276'
-    }
-    
-    # Client/Frontend Layer
-    frontend_group = ET.SubElement(svg, 'g', {'id': 'frontend'})
-    frontend_rect = ET.SubElement(frontend_group, 'rect', {
-        'x': '100',
-        'y': '150',
-        'width': '250',
-        'height': '100',
-        'fill': colors['client'],
-        'stroke': '#000',
-        'stroke-width': '2',
-        'rx': '10'
-    })
-    frontend_text = ET.SubElement(frontend_group, 'text', {
-        'x': '225',
-        'y': '190',
-        'font-size': '18',
-        'font-weight': 'bold',
-        'text-anchor': 'middle',
-        'fill': 'white'
-    })
-    frontend_text.text = 'React Frontend'
-    frontend_subtext = ET.SubElement(frontend_group, 'text', {
-        'x': '225',
-        'y': '220',
-        'font-size': '14',
-        'text-anchor': 'middle',
-        'fill': 'white'
-    })
-    frontend_subtext.text = 'TypeScript + Tailwind CSS'
+    parts.append(text(800, 50, _TXT_NAVY_32_BOLD, 'AWS Serverless RAG System Architecture'))
+    parts.append(text(800, 85, _TXT_GRAY_18, 'Current Implementation with OpenSearch'))
     
-    # API Gateway
-    api_group = ET.SubElement(svg, 'g', {'id': 'api-gateway'})
-    api_rect = ET.SubElement(api_group, 'rect', {
-        'x': '650',
-        'y': '150',
-        'width': '300',
-        'height': '100',
-        'fill': colors['api'],
-        'stroke': '#000',
-        'stroke-width': '2',
-        'rx': '10'
-    })
-    api_text = ET.SubElement(api_group, 'text', {
-        'x': '800',
-        'y': '190',
-        'font-size': '18',
-        'font-weight': 'bold',
-        'text-anchor': 'middle',
-        'fill': 'white'
-    })
-    api_text.text = 'API Gateway'
-    api_subtext = ET.SubElement(api_group, 'text', {
-        'x': '800',
-        'y': '220',
-        'font-size': '14',
-        'text-anchor': 'middle',
-        'fill': 'white'
-    })
-    api_subtext.text = 'REST API with CORS'
+    # Client, API and storage boxes
+    for spec in BOXES:
+        emit_box(parts, spec)
     
     # Lambda Functions Layer
-    lambda_functions = [
-        {'name': 'Upload', 'x': 150, 'desc': 'File Upload'},
-        {'name': 'Process', 'x': 350, 'desc': 'Text Extract'},
-        {'name': 'Query', 'x': 550, 'desc': 'RAG Query'},
-        {'name': 'Dashboard', 'x': 750, 'desc': 'Statistics'},
-        {'name': 'Status', 'x': 950, 'desc': 'Doc Status'},
-        {'name': 'Delete', 'x': 1150, 'desc': 'Doc Delete'}
-    ]
-    
-    for func in lambda_functions:
-        func_group = ET.SubElement(svg, 'g', {'id': f'lambda-{func["name"].lower()}'})
-        func_rect = ET.SubElement(func_group, 'rect', {
-            'x': str(func['x']),
-            'y': '350',
-            'width': '150',
-            'height': '80',
-            'fill': colors['lambda'],
-            'stroke': '#000',
-            'stroke-width': '2',
-            'rx': '8'
-        })
-        func_text = ET.SubElement(func_group, 'text', {
-            'x': str(func['x'] + 75),
-            'y': '380',
-            'font-size': '14',
-            'font-weight': 'bold',
-            'text-anchor': 'middle',
-            'fill': 'white'
-        })
-        func_text.text = func['name']
-        func_desc = ET.SubElement(func_group, 'text', {
-            'x': str(func['x'] + 75),
-            'y': '405',
-            'font-size': '11',
-            'text-anchor': 'middle',
-            'fill': 'white'
-        })
-        func_desc.text = func['desc']
-    
-    # Storage Layer
-    # S3 Bucket
-    s3_group = ET.SubElement(svg, 'g', {'id': 's3'})
-    s3_rect = ET.SubElement(s3_group, 'rect', {
-        'x': '100',
-        'y': '550',
-        'width': '200',
-        'height': '100',
-        'fill': colors['storage'],
-        'stroke': '#000',
-        'stroke-width': '2',
-        'rx': '10'
-    })
-    s3_text = ET.SubElement(s3_group, 'text', {
-        'x': '200',
-        'y': '590',
-        'font-size': '16',
-        'font-weight': 'bold',
-        'text-anchor': 'middle',
-        'fill': 'white'
-    })
-    s3_text.text = 'S3 Bucket'
-    s3_desc = ET.SubElement(s3_group, 'text', {
-        'x': '200',
-        'y': '620',
-        'font-size': '12',
-        'text-anchor': 'middle',
-        'fill': 'white'
-    })
-    s3_desc.text = 'Document Storage'
-    
-    # DynamoDB
-    dynamo_group = ET.SubElement(svg, 'g', {'id': 'dynamodb'})
-    dynamo_rect = ET.SubElement(dynamo_group, 'rect', {
-        'x': '350',
-        'y': '550',
-        'width': '200',
-        'height': '100',
-        'fill': colors['storage'],
-        'stroke': '#000',
-        'stroke-width': '2',
-        'rx': '10'
-    })
-    dynamo_text = ET.SubElement(dynamo_group, 'text', {
-        'x': '450',
-        'y': '590',
-        'font-size': '16',
-        'font-weight': 'bold',
-        'text-anchor': 'middle',
-        'fill': 'white'
-    })
-    dynamo_text.text = 'DynamoDB'
-    dynamo_desc = ET.SubElement(dynamo_group, 'text', {
-        'x': '450',
-        'y': '620',
-        'font-size': '12',
-        'text-anchor': 'middle',
-        'fill': 'white'
-    })
-    dynamo_desc.text = 'Document Metadata'
-    
-    # OpenSearch
-    opensearch_group = ET.SubElement(svg, 'g', {'id': 'opensearch'})
-    opensearch_rect = ET.SubElement(opensearch_group, 'rect', {
-        'x': '600',
-        'y': '550',
-        'width': '300',
-        'height': '100',
-        'fill': colors['search'],
-        'stroke': '#000',
-        'stroke-width': '2',
-        'rx': '10'
-    })
-    opensearch_text = ET.SubElement(opensearch_group, 'text', {
-        'x': '750',
-        'y': '590',
-        'font-size': '16',
-        'font-weight': 'bold',
-        'text-anchor': 'middle',
-        'fill': 'white'
-    })
-    opensearch_text.text = 'OpenSearch Service'
-    opensearch_desc = ET.SubElement(opensearch_group, 'text', {
-        'x': '750',
-        'y': '620',
-        'font-size': '12',
-        'text-anchor': 'middle',
-        'fill': 'white'
-    })
-    opensearch_desc.text = 'Vector Search (t3.small)'
-    
-    # CloudWatch
-    cloudwatch_group = ET.SubElement(svg, 'g', {'id': 'cloudwatch'})
-    cloudwatch_rect = ET.SubElement(cloudwatch_group, 'rect', {
-        'x': '950',
-        'y': '550',
-        'width': '200',
-        'height': '100',
-        'fill': '#759C3E',
-        'stroke': '#000',
-        'stroke-width': '2',
-        'rx': '10'
-    })
-    cloudwatch_text = ET.SubElement(cloudwatch_group, 'text', {
-        'x': '1050',
-        'y': '590',
-        'font-size': '16',
-        'font-weight': 'bold',
-        'text-anchor': 'middle',
-        'fill': 'white'
-    })
-    cloudwatch_text.text = 'CloudWatch'
-    cloudwatch_desc = ET.SubElement(cloudwatch_group, 'text', {
-        'x': '1050',
-        'y': '620',
-        'font-size': '12',
-        'text-anchor': 'middle',
-        'fill': 'white'
-    })
-    cloudwatch_desc.text = 'Logs & Metrics'
+    for func in LAMBDA_FUNCTIONS:
+        parts.append(_LAMBDA_GROUP.format(
+            id=func['name'].lower(), x=func['x'], cx=func['x'] + 75,
+            name=escape(func['name']), desc=escape(func['desc'])))
     
     # Bedrock Services
-    bedrock_group = ET.SubElement(svg, 'g', {'id': 'bedrock'})
-    bedrock_rect = ET.SubElement(bedrock_group, 'rect', {
-        'x': '400',
-        'y': '750',
-        'width': '800',
-        'height': '120',
-        'fill': colors['ai'],
-        'stroke': '#000',
-        'stroke-width': '2',
-        'rx': '10'
-    })
-    bedrock_text = ET.SubElement(bedrock_group, 'text', {
-        'x': '800',
-        'y': '790',
-        'font-size': '20',
-        'font-weight': 'bold',
-        'text-anchor': 'middle',
-        'fill': 'white'
-    })
-    bedrock_text.text = 'Amazon Bedrock'
+    parts.append('<g id="bedrock">')
+    parts.append(rect(400, 750, 800, 120, COLORS['ai'], rx=10))
+    parts.append(text(800, 790, _TXT_WHITE_20_BOLD, 'Amazon Bedrock'))
     
     # Bedrock services
-    titan_text = ET.SubElement(bedrock_group, 'text', {
-        'x': '600',
-        'y': '830',
-        'font-size': '14',
-        'text-anchor': 'middle',
-        'fill': 'white'
-    })
-    titan_text.text = 'Titan Embeddings V1'
-    
-    claude_text = ET.SubElement(bedrock_group, 'text', {
-        'x': '1000',
-        'y': '830',
-        'font-size': '14',
-        'text-anchor': 'middle',
-        'fill': 'white'
-    })
-    claude_text.text = 'Claude 3 Sonnet'
-    
-    dimension_text = ET.SubElement(bedrock_group, 'text', {
-        'x': '800',
-        'y': '855',
-        'font-size': '11',
-        'text-anchor': 'middle',
-        'fill': 'white',
-        'font-style': 'italic'
-    })
-    dimension_text.text = '(1536-dimensional vectors)'
+    parts.append(text(600, 830, _TXT_WHITE_14, 'Titan Embeddings V1'))
+    parts.append(text(1000, 830, _TXT_WHITE_14, 'Claude 3 Sonnet'))
+    parts.append(text(800, 855, _TXT_WHITE_11_ITALIC, '(1536-dimensional vectors)'))
+    parts.append('</g>')
     
     # Connection lines
     def add_arrow(x1, y1, x2, y2, label=''):
-        line = ET.SubElement(svg, 'line', {
-            'x1': str(x1),
-            'y1': str(y1),
-            'x2': str(x2),
-            'y2': str(y2),
-            'stroke': '#333',
-            'stroke-width': '2',
-            'marker-end': 'url(#arrowhead)'
-        })
+        parts.append(f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" stroke="#333" '
+                     'stroke-width="2" marker-end="url(#arrowhead)" />')
         if label:
             mid_x = (x1 + x2) / 2
             mid_y = (y1 + y2) / 2
-            label_bg = ET.SubElement(svg, 'rect', {
-                'x': str(mid_x - 40),
-                'y': str(mid_y - 10),
-                'width': '80',
-                'height': '20',
-                'fill': 'white',
-                'stroke': '#333',
-                'stroke-width': '1',
-                'rx': '3'
-            })
-            label_text = ET.SubElement(svg, 'text', {
-                'x': str(mid_x),
-                'y': str(mid_y + 5),
-                'font-size': '10',
-                'text-anchor': 'middle',
-                'fill': '#333'
-            })
-            label_text.text = label
-    
-    # Define arrow marker
-    defs = ET.SubElement(svg, 'defs')
-    marker = ET.SubElement(defs, 'marker', {
-        'id': 'arrowhead',
-        'markerWidth': '10',
-        'markerHeight': '7',
-        'refX': '10',
-        'refY': '3.5',
-        'orient': 'auto'
-    })
-    polygon = ET.SubElement(marker, 'polygon', {
-        'points': '0 0, 10 3.5, 0 7',
-        'fill': '#333'
-    })
+            parts.append(rect(mid_x - 40, mid_y - 10, 80, 20, 'white', rx=3,
+                              stroke='#333', stroke_width=1))
+            parts.append(text(mid_x, mid_y + 5, _TXT_DARK_10, label))
     
     # Add connections
-    # Frontend to API Gateway
-    add_arrow(350, 200, 650, 200, 'HTTPS')
-    
-    # API Gateway to Lambda functions
-    add_arrow(800, 250, 225, 350)
-    add_arrow(800, 250, 425, 350)
-    add_arrow(800, 250, 625, 350)
-    add_arrow(800, 250, 825, 350)
-    add_arrow(800, 250, 1025, 350)
-    add_arrow(800, 250, 1225, 350)
-    
-    # Lambda to Storage connections
-    # Upload to S3
-    add_arrow(225, 430, 200, 550)
-    # Process to S3, DynamoDB, OpenSearch
-    add_arrow(425, 430, 200, 550)
-    add_arrow(425, 430, 450, 550)
-    add_arrow(425, 430, 750, 550)
-    # Query to OpenSearch
-    add_arrow(625, 430, 750, 550)
-    # Dashboard to S3, OpenSearch
-    add_arrow(825, 430, 200, 550)
-    add_arrow(825, 430, 750, 550)
-    # Status to OpenSearch
-    add_arrow(1025, 430, 750, 550)
-    # Delete to S3, DynamoDB
-    add_arrow(1225, 430, 200, 550)
-    add_arrow(1225, 430, 450, 550)
-    
-    # Lambda to CloudWatch
-    add_arrow(825, 430, 1050, 550)
-    
-    # Lambda to Bedrock
-    add_arrow(425, 430, 600, 750)
-    add_arrow(625, 430, 1000, 750)
+    for x1, y1, x2, y2, label in ARROWS:
+        add_arrow(x1, y1, x2, y2, label)
     
     # Key Features Box
-    features_group = ET.SubElement(svg, 'g', {'id': 'features'})
-    features_rect = ET.SubElement(features_group, 'rect', {
-        'x': '50',
-        'y': '950',
-        'width': '1500',
-        'height': '180',
-        'fill': 'white',
-        'stroke': '#333',
-        'stroke-width': '2',
-        'rx': '10'
-    })
-    
-    features_title = ET.SubElement(features_group, 'text', {
-        'x': '800',
-        'y': '980',
-        'font-size': '18',
-        'font-weight': 'bold',
-        'text-anchor': 'middle',
-        'fill': '#232F3E'
-    })
-    features_title.text = 'System Specifications'
+    parts.append('<g id="features">')
+    parts.append(rect(50, 950, 1500, 180, 'white', rx=10, stroke='#333'))
+    parts.append(text(800, 980, _TXT_NAVY_18_BOLD, 'System Specifications'))
     
     # Feature columns
-    features_data = [
-        ('Lambda Functions', ['6 Functions (Go)', 'provided.al2023 runtime', '512MB Memory', '30s-300s Timeout'], 200),
-        ('Storage', ['S3 with Versioning', 'DynamoDB Pay-per-request', 'CloudWatch 14-day retention'], 500),
-        ('Search', ['OpenSearch 2.3', 't3.small instance', '10GB gp3 storage', 'KNN Vector Search'], 800),
-        ('AI/ML', ['Titan Embeddings V1', 'Claude 3 Sonnet', '1536-dim vectors', 'RAG Generation'], 1100),
-        ('API', ['REST API', 'CORS Enabled', 'OpenAPI 3.0.1', 'Multiple Endpoints'], 1400)
-    ]
-    
-    for title, items, x in features_data:
-        col_title = ET.SubElement(features_group, 'text', {
-            'x': str(x),
-            'y': '1010',
-            'font-size': '14',
-            'font-weight': 'bold',
-            'text-anchor': 'middle',
-            'fill': '#146EB4'
-        })
-        col_title.text = title
+    for title, items, x in FEATURES:
+        parts.append(text(x, 1010, _TXT_BLUE_14_BOLD, title))
         
         for i, item in enumerate(items):
-            item_text = ET.SubElement(features_group, 'text', {
-                'x': str(x),
-                'y': str(1035 + i * 20),
-                'font-size': '11',
-                'text-anchor': 'middle',
-                'fill': '#333'
-            })
-            item_text.text = f'• {item}'
+            parts.append(text(x, 1035 + i * 20, _TXT_DARK_11, f'• {item}'))
+    parts.append('</g>')
     
-    return ET.tostring(svg, encoding='unicode')
+    parts.append('</svg>')
+    return ''.join(parts)
 
-# Generate SVG
-svg_content = create_svg_architecture()
+def read_diagram_key(path):
+    """Return the key comment line of a previously generated SVG, if any"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            f.readline()  # XML declaration
+            return f.readline().strip()
+    except OSError:
+        return None
 
-# Save SVG file
-with open('aws-architecture.svg', 'w') as f:
-    f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-    f.write(svg_content)
+def convert_with_tool(name, label, args):
+    """Convert the SVG file to PNG with an external tool, if it is installed"""
+    path = shutil.which(name)
+    if path is None:
+        return False
+    try:
+        subprocess.run([path] + args, check=True, stdout=subprocess.DEVNULL)
+    except subprocess.CalledProcessError:
+        return False
+    print(f"PNG created using {label}: aws-architecture.png")
+    return True
 
-print("SVG architecture diagram created: aws-architecture.svg")
+def convert_with_cairosvg(svg_data):
+    """Convert the in-memory SVG to PNG without spawning a process"""
+    if cairosvg is None:
+        return False
+    try:
+        cairosvg.svg2png(bytestring=svg_data,
+                         write_to='aws-architecture.png', output_width=1600)
+    except Exception as e:
+        # cairosvg and cairo raise a variety of error types; fall through to the next converter
+        print(f"cairosvg failed: {e}")
+        if os.path.exists('aws-architecture.png'):
+            os.remove('aws-architecture.png')
+        return False
+    print("PNG created using cairosvg: aws-architecture.png")
+    return True
 
-# Try to convert to PNG using different methods
-conversion_successful = False
+# Renders the SVG file in a child interpreter so a losing cairosvg run can be terminated
+CAIROSVG_SCRIPT = ('import sys, cairosvg; '
+                   'cairosvg.svg2png(url=sys.argv[1], write_to=sys.argv[2], output_width=1600)')
 
-# Method 1: Try using rsvg-convert
-try:
-    subprocess.run(['rsvg-convert', '-f', 'png', '-o', 'aws-architecture.png', 'aws-architecture.svg'], check=True)
-    print("PNG created using rsvg-convert: aws-architecture.png")
-    conversion_successful = True
-except (subprocess.CalledProcessError, FileNotFoundError):
-    pass
-
-# Method 2: Try using inkscape
-if not conversion_successful:
-    try:
-        subprocess.run(['inkscape', 'aws-architecture.svg', '--export-type=png', '--export-filename=aws-architecture.png'], check=True)
-        print("PNG created using Inkscape: aws-architecture.png")
-        conversion_successful = True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass
-
-# Method 3: Try using convert (ImageMagick)
-if not conversion_successful:
-    try:
-        subprocess.run(['convert', 'aws-architecture.svg', 'aws-architecture.png'], check=True)
-        print("PNG created using ImageMagick: aws-architecture.png")
-        conversion_successful = True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass
-
-if not conversion_successful:
-    print("\nNote: To convert SVG to PNG, you need one of these tools installed:")
-    print("  - rsvg-convert (sudo apt-get install librsvg2-bin)")
-    print("  - inkscape (sudo apt-get install inkscape)")
-    print("  - convert (sudo apt-get install imagemagick)")
-    print("\nThe SVG file has been created and can be viewed in a web browser.")
\ No newline at end of file
+def convert_hedged(rsvg_path):
+    """Race rsvg-convert against cairosvg and keep whichever PNG is ready first"""
+    outputs = {
+        'rsvg-convert': 'aws-architecture.png.rsvg',
+        'cairosvg': 'aws-architecture.png.cairo'
+    }
+    procs = {
+        'rsvg-convert': subprocess.Popen(
+            [rsvg_path, '-f', 'png', '-o', outputs['rsvg-convert'], 'aws-architecture.svg'],
+            stdout=subprocess.DEVNULL),
+        'cairosvg': subprocess.Popen(
+            [sys.executable, '-c', CAIROSVG_SCRIPT, 'aws-architecture.svg', outputs['cairosvg']],
+            stdout=subprocess.DEVNULL)
+    }
+
+    winner = None
+    with ThreadPoolExecutor(max_workers=len(procs)) as pool:
+        futures = {pool.submit(proc.wait): name for name, proc in procs.items()}
+        pending = set(futures)
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.result() == 0:
+                    winner = futures[future]
+                    break
+        # Terminating the loser also ends the thread waiting on it
+        for proc in procs.values():
+            if proc.poll() is None:
+                proc.terminate()
+
+    for name, output in outputs.items():
+        if name == winner:
+            os.replace(output, 'aws-architecture.png')
+        elif os.path.exists(output):
+            os.remove(output)
+
+    if winner is None:
+        return False
+    print(f"PNG created using {winner}: aws-architecture.png")
+    return True
+
+def main():
+    """Generate aws-architecture.svg and convert it to PNG"""
+    # Skip regeneration when both outputs already match this version of the script
+    if (read_diagram_key('aws-architecture.svg') == key_comment(1600, 1200)
+            and os.path.exists('aws-architecture.png')):
+        print("aws-architecture.svg and aws-architecture.png are up to date")
+        return
+
+    # Generate SVG
+    svg_data = create_svg_architecture().encode('utf-8')
+
+    # Save SVG file
+    with open('aws-architecture.svg', 'wb', buffering=1 << 20) as f:
+        f.write(svg_data)
+
+    print("SVG architecture diagram created: aws-architecture.svg")
+
+    # A PNG from an older version of the script must not survive a failed
+    # conversion, or the up-to-date check above would accept it
+    if os.path.exists('aws-architecture.png'):
+        os.remove('aws-architecture.png')
+
+    # Try to convert to PNG using whichever tool is installed
+    rsvg_path = shutil.which(RSVG_CONVERT[0])
+    if rsvg_path is not None and cairosvg is not None:
+        conversion_successful = convert_hedged(rsvg_path)
+    else:
+        conversion_successful = convert_with_tool(*RSVG_CONVERT) or convert_with_cairosvg(svg_data)
+
+    if not conversion_successful:
+        conversion_successful = any(convert_with_tool(*converter) for converter in FALLBACK_CONVERTERS)
+
+    if not conversion_successful:
+        print("\nNote: To convert SVG to PNG, you need one of these tools installed:")
+        print("  - rsvg-convert (sudo apt-get install librsvg2-bin)")
+        print("  - cairosvg (pip install cairosvg)")
+        print("  - inkscape (sudo apt-get install inkscape)")
+        print("  - convert (sudo apt-get install imagemagick)")
+        print("\nThe SVG file has been created and can be viewed in a web browser.")
+
+if __name__ == '__main__':
+    main()
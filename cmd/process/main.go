@@ -554,7 +554,8 @@ func ensureVectorIndexExists(sess *session.Session, endpoint string) error {
 		"settings": map[string]interface{}{
 			"index": map[string]interface{}{
 				"knn":                      true,
-				"knn.algo_param.ef_search": 512,
+				"knn.algo_param.ef_search": 128,
+				"refresh_interval":         "30s",
 			},
 		},
 	}
@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
+# Creates the rag-documents-prod KNN index.
+# Requires boto3 and opensearch-py >= 2.4 (for Urllib3AWSV4SignerAuth):
+#   pip install boto3 'opensearch-py>=2.4'
 import json
 import boto3
 import sys
-from opensearchpy import OpenSearch, RequestsHttpConnection
-from requests_aws4auth import AWS4Auth
+from opensearchpy import OpenSearch, Urllib3AWSV4SignerAuth, Urllib3HttpConnection
 
 # AWS credentials
 session = boto3.Session()
@@ -13,16 +15,19 @@ region = 'ap-northeast-1'
 # OpenSearch configuration
 host = 'search-rag-prod-search-dae2plhddn3kqzecgv47aalwba.ap-northeast-1.es.amazonaws.com'
 service = 'es'
-awsauth = AWS4Auth(credentials.access_key, credentials.secret_key,
-                   region, service, session_token=credentials.token)
+awsauth = Urllib3AWSV4SignerAuth(credentials, region, service)
 
 # Create OpenSearch client
+# urllib3 keeps the TLS connection alive across the calls below, and the
+# index body is sent gzip-compressed (the signature covers the compressed body)
 client = OpenSearch(
     hosts=[{'host': host, 'port': 443}],
     http_auth=awsauth,
     use_ssl=True,
     verify_certs=True,
-    connection_class=RequestsHttpConnection
+    connection_class=Urllib3HttpConnection,
+    http_compress=True,
+    timeout=30
 )
 
 index_name = 'rag-documents-prod'
@@ -34,7 +39,12 @@ index_body = {
         "number_of_replicas": 1,
         "index": {
             "knn": True,
-            "knn.algo_param.ef_search": 512
+            # Queries return at most 20 chunks (max_results); 128 candidates keeps
+            # recall close to 512 at a fraction of the graph traversal per query
+            "knn.algo_param.ef_search": 128,
+            # Bulk writes from the process Lambda are made searchable every 30s
+            # instead of every 1s, so fewer small segments are flushed during ingest
+            "refresh_interval": "30s"
         }
     },
     "mappings": {
@@ -23,7 +23,8 @@ curl -X PUT "https://${OPENSEARCH_ENDPOINT}/${INDEX_NAME}" \
       "number_of_replicas": 1,
       "index": {
         "knn": true,
-        "knn.algo_param.ef_search": 512
+        "knn.algo_param.ef_search": 128,
+        "refresh_interval": "30s"
       }
     },
     "mappings": {